@@ -33,6 +33,12 @@ class MultiIPZMQClient:
         """Setup ZMQ sockets for each target."""
         for ip, port in self.targets:
             socket = self.context.socket(zmq.REQ)
+            # A timed-out request must not leave the REQ socket stuck waiting for
+            # its reply: RELAXED allows the next send, CORRELATE drops the late
+            # reply. LINGER 0 keeps close()/term() from blocking on dead targets.
+            socket.setsockopt(zmq.REQ_RELAXED, 1)
+            socket.setsockopt(zmq.REQ_CORRELATE, 1)
+            socket.setsockopt(zmq.LINGER, 0)
             socket.connect(f"tcp://{ip}:{port}")
             self.sockets[(ip, port)] = socket
             print(f"🔗 Connected to {ip}:{port}")
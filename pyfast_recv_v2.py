@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 import argparse, multiprocessing as mp, os, socket, struct, sys, traceback, shutil, json, time
 import threading, zmq, logging
-from typing import Tuple
+from typing import List, Optional, Tuple
 from datetime import datetime
 import redis
 CHUNK = 1 << 20
@@ -47,6 +47,32 @@ MAX_DEST = 4096
 MAX_DRAGONFLY_KEY = 256
 MAX_SIDE = 64
 
+# Directories this process already knows exist, so per-file writes can skip
+# makedirs' stat-per-component walk. Entries may go stale when a ball_id
+# cleanup (possibly in another worker) removes a tree; writers fall back to
+# recreating the directory on FileNotFoundError.
+_mkdir_cache = set()
+
+
+def ensure_dir(path: str) -> None:
+    if path in _mkdir_cache:
+        return
+    try:
+        if os.path.dirname(path) in _mkdir_cache:
+            os.mkdir(path)
+        else:
+            os.makedirs(path, exist_ok=True)
+    except FileExistsError:
+        pass
+    except FileNotFoundError:
+        os.makedirs(path, exist_ok=True)
+    _mkdir_cache.add(path)
+
+
+def forget_dirs(root: str) -> None:
+    stale = {d for d in _mkdir_cache if d == root or d.startswith(root + os.sep)}
+    _mkdir_cache.difference_update(stale)
+
 
 def handle_client(conn, out_dir, verbose, expect_count_first, use_dest_paths, cleanup_max_count, cleanup_ttl_seconds, global_state_file, global_state_lock):
     try:
@@ -112,6 +138,8 @@ def handle_client(conn, out_dir, verbose, expect_count_first, use_dest_paths, cl
                         sentinel_done = os.path.join(sentinel_dir, f"{ball_id}.done")
                         sentinel_lock = sentinel_done + ".lock"
 
+                        # Once per connection, and uncached: clear_destination.py
+                        # may remove the sentinels while receivers keep running
                         try:
                             os.makedirs(sentinel_dir, exist_ok=True)
                         except Exception:
@@ -160,6 +188,7 @@ def handle_client(conn, out_dir, verbose, expect_count_first, use_dest_paths, cl
                                                 logger = logging.getLogger(__name__)
                                                 logger.info(f"[recv] cleanup existing data for ball_id '{ball_id}' in {target_norm}")
                                             shutil.rmtree(target_norm)
+                                            forget_dirs(target_norm)
                                     except Exception:
                                         pass
                                 state["count"] = int(state.get("count", 0)) + 1
@@ -184,11 +213,19 @@ def handle_client(conn, out_dir, verbose, expect_count_first, use_dest_paths, cl
                     final_path = os.path.join(out_dir, name)
 
                 tmp_path = final_path + ".part"
-                os.makedirs(os.path.dirname(final_path) or out_dir, exist_ok=True)
+                final_dir = os.path.dirname(final_path) or out_dir
+                ensure_dir(final_dir)
 
                 remaining = size
                 try:
-                    with open(tmp_path, "wb", buffering=0) as f:
+                    try:
+                        f = open(tmp_path, "wb", buffering=0)
+                    except FileNotFoundError:
+                        # Cached directory was removed since we created it
+                        forget_dirs(final_dir)
+                        ensure_dir(final_dir)
+                        f = open(tmp_path, "wb", buffering=0)
+                    with f:
                         while remaining:
                             chunk = conn.recv(min(CHUNK, remaining))
                             if not chunk:
@@ -277,7 +314,7 @@ def worker(bind: Tuple[str, int], out_dir: str, reuseport: bool, verbose: bool,
         srv.close()
 
 
-def main():
+def main(argv: Optional[List[str]] = None):
     ap = argparse.ArgumentParser(description="Receiver v2 with destination path support (one-time emit)")
     ap.add_argument("--listen-ip", default="0.0.0.0")
     ap.add_argument("--port", type=int, required=True)
@@ -292,7 +329,7 @@ def main():
     ap.add_argument("--emit-threshold", type=int, default=100)
     ap.add_argument("--zmq-endpoint", default="tcp://localhost:5623")
     ap.add_argument("--zmq-topic", default="")
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     # Setup logging
     base_dir = os.path.dirname(os.path.abspath(__file__))
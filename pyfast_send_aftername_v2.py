@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-import argparse, fnmatch, os, queue, socket, struct, threading, time, sys, json, re, logging
+import argparse, bisect, fnmatch, os, queue, signal, socket, struct, threading, time, sys, json, re, logging
 from typing import List, Tuple, Optional, Dict, Any
 from datetime import datetime
 try:
@@ -24,8 +24,10 @@ def setup_logging(log_file: Optional[str] = None):
     if log_dir and not os.path.exists(log_dir):
         os.makedirs(log_dir, exist_ok=True)
     
-    # Configure logging
+    # Configure logging (force: a pooled worker process runs many sends and
+    # each one gets its own log file, as it would as a fresh process)
     logging.basicConfig(
+        force=True,
         level=logging.DEBUG,
         format='%(asctime)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S',
@@ -320,14 +322,14 @@ def send_file(sock, src_path, rel_name, dest_path, dragonfly_key, side, verbose,
     counters["files"] += 1
     counters["bytes"] += size
 
-def worker_thread(host: str, port: int, q: "queue.Queue[Tuple[str,str,str]]", tid: int, verbose: bool, counters: dict, error_queue: "queue.Queue[Tuple[str,str,str]]", dragonfly_key: str, side: str):
+def worker_thread(host: str, port: int, q: "queue.Queue[Tuple[str,str,str,str,str]]", tid: int, verbose: bool, counters: dict, error_queue: "queue.Queue[Tuple[str,str,str]]"):
     dest = (host, port); sock = None
     max_retries = 3
     
     while True:
         item = q.get()
         if item is None: break
-        src_path, rel_name, dest_path = item
+        src_path, rel_name, dest_path, dragonfly_key, side = item
         
         retry_count = 0
         success = False
@@ -395,15 +397,111 @@ def worker_thread(host: str, port: int, q: "queue.Queue[Tuple[str,str,str]]", ti
 
 def discover_once(src_dir: str, pattern: str) -> List[str]:
     try:
-        names = [n for n in os.listdir(src_dir) if fnmatch.fnmatch(n, pattern)]
+        names = fnmatch.filter(os.listdir(src_dir), pattern)
     except FileNotFoundError:
         return []
     names.sort()
     return names
 
+def enqueue_backlog(args: argparse.Namespace, q: "queue.Queue[Tuple[str,str,str,str,str]]", start_after: str, dest_path_prefix: str, dragonfly_key: str, side: str) -> Tuple[int, str]:
+    """
+    Enqueue every complete file named > start_after (up to --max-files).
+    Returns (enqueued_files, last_name).
+    """
+    enqueued_files = 0
+    last_name = start_after
+    names = discover_once(args.src_dir, args.pattern)
+    # Names are sorted, so skip everything <= start_after without visiting it
+    for name in names[bisect.bisect_right(names, start_after):]:
+        if args.max_files and enqueued_files >= args.max_files:
+            break
+        if name > last_name:
+            full = os.path.join(args.src_dir, name)
+            # NEW: lookahead-fast path
+            fast_ok = False
+            if args.lookahead > 0 and lookahead_exists(args.src_dir, name, args.lookahead):
+                fast_ok = True
+            if not fast_ok:
+                if not wait_for_file_and_check_complete(full, args.stable_ms, args.stable_passes, args.max_wait_seconds, args.file_wait_ms):
+                    if args.verbose:
+                        logging.warning(f"[WARNING] File {name} not ready, skipping")
+                    continue
+            dest_path = generate_dest_path(args.src_dir, name, dest_path_prefix, args.preserve_structure)
+            q.put((full, name, dest_path, dragonfly_key, side))
+            enqueued_files += 1
+            last_name = name
+    return enqueued_files, last_name
+
+def drain_errors(error_q: "queue.Queue[Tuple[str,str,str]]") -> List[Tuple[str, str]]:
+    errors = []
+    while not error_q.empty():
+        try:
+            src_path, rel_name, error_msg = error_q.get_nowait()
+            errors.append((rel_name, error_msg))
+        except queue.Empty:
+            break
+    return errors
+
+# ---------- server mode ----------
+
+def serve_requests(args: argparse.Namespace, q: "queue.Queue[Tuple[str,str,str,str,str]]", error_q: "queue.Queue[Tuple[str,str,str]]", counters: dict) -> int:
+    """
+    Keep the process and its worker threads running and send one backlog per
+    request (each file still opens its own connection, as in normal mode).
+
+    Requests arrive on a Unix socket as JSON lines
+    {"start_after": ..., "dest_path": ..., "dragonfly_key": ..., "side": ...};
+    each is answered with {"rc": ..., "files": ..., "errors": ..., "elapsed_s": ...}
+    once its files are acknowledged. Requests are handled one at a time.
+    """
+    try:
+        os.unlink(args.server)
+    except FileNotFoundError:
+        pass
+    srv = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    srv.bind(args.server)
+    srv.listen(16)
+    logging.info(f"[server] listening on {args.server}")
+    # The launcher stops servers with SIGTERM; exit through the finally below so the socket file is removed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        while True:
+            conn, _ = srv.accept()
+            try:
+                with conn, conn.makefile("rwb") as f:
+                    for line in f:
+                        try:
+                            req = json.loads(line)
+                        except ValueError as e:
+                            logging.error(f"[server] invalid request: {e}")
+                            f.write(b'{"rc": 2}\n'); f.flush()
+                            continue
+                        t0 = time.time()
+                        files0 = counters["files"]
+                        if args.cleanup_part_files:
+                            cleanup_stale_part_files(args.src_dir, args.pattern, args.part_file_max_age, args.verbose)
+                        enqueue_backlog(args, q, req.get("start_after", ""), req.get("dest_path", args.dest_path), req.get("dragonfly_key", ""), req.get("side", ""))
+                        q.join()
+                        errors = drain_errors(error_q)
+                        reply = {"rc": 1 if errors else 0, "files": counters["files"] - files0, "errors": len(errors), "elapsed_s": time.time() - t0}
+                        logging.info(f"[server] start-after='{req.get('start_after', '')}' -> {reply}")
+                        f.write(json.dumps(reply).encode() + b"\n"); f.flush()
+            except OSError as e:
+                # The client gave up (e.g. launcher timeout); keep serving
+                logging.warning(f"[server] connection dropped: {e}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        srv.close()
+        try:
+            os.unlink(args.server)
+        except OSError:
+            pass
+    return 0
+
 # ---------- main ----------
 
-def main():
+def main(argv: Optional[List[str]] = None) -> int:
     ap = argparse.ArgumentParser(description="Sender (start-after filename + tail) with lookahead-complete & multi-pass stability (polling only). Supports destination path specification.")
     ap.add_argument("--src-dir", required=True)
     ap.add_argument("--start-after", default="", help="Send files with names > this (lexicographic). Empty means send all.")
@@ -426,6 +524,7 @@ def main():
     # stop/behavior
     ap.add_argument("--max-files", type=int, default=0, help="Stop after sending this many files (0 = unlimited)")
     ap.add_argument("--once", action="store_true", help="Send current backlog and exit (no tail)")
+    ap.add_argument("--server", default="", help="Unix socket path: stay running and send one backlog per JSON request received there, reusing the running worker threads (--start-after, --dest-path, --dragonfly-key, --side and --once come from each request instead)")
 
     # path handling
     ap.add_argument("--dest-path", default="", help="Destination path prefix for files on receiver (empty = use filename only)")
@@ -440,7 +539,7 @@ def main():
     ap.add_argument("--json-stats", action="store_true", help="Print stats in JSON on exit")
     ap.add_argument("--log-file", default=None, help="Log file path (default: logs/sender_TIMESTAMP.log)")
 
-    args = ap.parse_args()
+    args = ap.parse_args(argv)
 
     # Setup logging
     log_file = setup_logging(args.log_file)
@@ -464,42 +563,23 @@ def main():
         if args.dest_path:
             logging.info(f"[send] dest_path='{args.dest_path}', preserve_structure={args.preserve_structure}")
 
-    q: "queue.Queue[Tuple[str,str,str]]" = queue.Queue(maxsize=max(1024, args.conns*128))
+    q: "queue.Queue[Tuple[str,str,str,str,str]]" = queue.Queue(maxsize=max(1024, args.conns*128))
     error_q: "queue.Queue[Tuple[str,str,str]]" = queue.Queue()
 
     # Shared counters (protected by GIL with simple int ops)
     counters = {"files": 0, "bytes": 0}
     threads: List[threading.Thread] = []
-    # Track how many files we have ENQUEUED to ensure deterministic max-files behavior
-    enqueued_files = 0
     t0 = time.time()
     for i in range(args.conns):
-        t = threading.Thread(target=worker_thread, args=(args.host, args.port, q, i, args.verbose, counters, error_q, args.dragonfly_key, args.side), daemon=True)
+        t = threading.Thread(target=worker_thread, args=(args.host, args.port, q, i, args.verbose, counters, error_q), daemon=True)
         t.start()
         threads.append(t)
 
-    # Backlog phase (respect start-after)
-    last_name = args.start_after
-    names_to_send = []
-    for name in discover_once(args.src_dir, args.pattern):
-        if args.max_files and enqueued_files >= args.max_files:
-            break
-        if name > last_name:
-            full = os.path.join(args.src_dir, name)
-            # NEW: lookahead-fast path
-            fast_ok = False
-            if args.lookahead > 0 and lookahead_exists(args.src_dir, name, args.lookahead):
-                fast_ok = True
-            if not fast_ok:
-                if not wait_for_file_and_check_complete(full, args.stable_ms, args.stable_passes, args.max_wait_seconds, args.file_wait_ms):
-                    if args.verbose:
-                        logging.warning(f"[WARNING] File {name} not ready, skipping")
-                    continue
-            dest_path = generate_dest_path(args.src_dir, name, args.dest_path, args.preserve_structure)
-            q.put((full, name, dest_path))
-            enqueued_files += 1
-            last_name = name
+    if args.server:
+        return serve_requests(args, q, error_q, counters)
 
+    # Backlog phase (respect start-after)
+    enqueued_files, last_name = enqueue_backlog(args, q, args.start_after, args.dest_path, args.dragonfly_key, args.side)
 
     # If only backlog is needed, drain and exit
     if args.once or (args.max_files and enqueued_files >= args.max_files):
@@ -511,7 +591,7 @@ def main():
         last_cleanup_time = time.time()
         while not args.max_files or enqueued_files < args.max_files:
             names = discover_once(args.src_dir, args.pattern)
-            for name in names:
+            for name in names[bisect.bisect_right(names, last_name):]:
                 if args.max_files and enqueued_files >= args.max_files:
                     break
                 if name > last_name:
@@ -526,7 +606,7 @@ def main():
                             continue
                     if not args.max_files or enqueued_files < args.max_files:
                         dest_path = generate_dest_path(args.src_dir, name, args.dest_path, args.preserve_structure)
-                        q.put((full, name, dest_path))
+                        q.put((full, name, dest_path, args.dragonfly_key, args.side))
                         enqueued_files += 1
                     last_name = name
             
@@ -547,13 +627,7 @@ def main():
     for t in threads: t.join()
 
     # Check for errors
-    errors = []
-    while not error_q.empty():
-        try:
-            src_path, rel_name, error_msg = error_q.get_nowait()
-            errors.append((rel_name, error_msg))
-        except queue.Empty:
-            break
+    errors = drain_errors(error_q)
 
     # Stats
     t1 = time.time()
@@ -572,7 +646,7 @@ def main():
         else:
             logging.info(f"[stats] elapsed={elapsed:.3f}s "
                   f"MiB={mb:.2f} rate={mbps:.2f} MiB/s  files/s={fps:.1f}")
-        sys.exit(1)  # Exit with error code if any files failed
+        return 1  # Exit with error code if any files failed
     else:
         if args.json_stats:
             print(json.dumps({"files": counters["files"], "bytes": counters["bytes"], "elapsed_s": elapsed, "MiB": mb, "MiB_per_s": mbps, "files_per_s": fps}))
@@ -580,5 +654,7 @@ def main():
             logging.info(f"[stats] elapsed={elapsed:.3f}s "
                   f"MiB={mb:.2f} rate={mbps:.2f} MiB/s  files/s={fps:.1f}")
 
+    return 0
+
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
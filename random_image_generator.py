@@ -7,6 +7,7 @@ Writes them into the specified output folder.
 
 Requires: pillow, numpy
 Install: pip install pillow numpy
+Optional: numba (parallel noise fill across all cores; not used when RANDOM_SEED is set)
 """
 
 import os
@@ -19,6 +20,11 @@ from typing import Tuple
 
 import numpy as np
 from PIL import Image
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
 
 # ---------- CONFIG ----------
 camera_names = ["camera01", "camera02", "camera03", "camera04", "camera05", "camera06"]
@@ -39,17 +45,47 @@ if RANDOM_SEED is not None:
     random.seed(RANDOM_SEED)
     np.random.seed(RANDOM_SEED)
 
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _fill_noise(out):
+        # numba keeps an independent random stream per thread, so rows can be
+        # filled in parallel without sharing generator state. One 24-bit draw
+        # per pixel supplies all three colour channels; the pad byte is unused.
+        for i in prange(out.shape[0]):
+            for j in range(out.shape[1]):
+                v = np.random.randint(0, 1 << 24)
+                out[i, j, 0] = v & 0xFF
+                out[i, j, 1] = (v >> 8) & 0xFF
+                out[i, j, 2] = (v >> 16) & 0xFF
+
 def random_image_array(w: int, h: int) -> np.ndarray:
-    """Return a random RGB uint8 numpy array shape (h, w, 3)."""
+    """
+    Return a random RGBX uint8 numpy array shape (h, w, 4); the 4th byte is
+    padding so the buffer matches Pillow's internal pixel layout.
+    With numba the fill runs on all cores, but draws from numba's own
+    generator, which np.random.seed() does not reach; when RANDOM_SEED is set
+    the numpy path is used instead so the output stays reproducible.
+    """
+    if NUMBA_AVAILABLE and RANDOM_SEED is None:
+        arr = np.empty((h, w, 4), dtype=np.uint8)
+        _fill_noise(arr)
+        return arr
     # Use random noise; mixture of smooth and noisy helps variety
     # create per-channel random values
-    arr = np.random.randint(0, 256, (h, w, 3), dtype=np.uint8)
+    arr = np.random.randint(0, 256, (h, w, 4), dtype=np.uint8)
     return arr
 
 def pil_image_from_array(arr: np.ndarray) -> Image.Image:
-    return Image.fromarray(arr, mode="RGB")
+    """
+    Wrap an (h, w, 4) RGBX array as a PIL image without copying pixels.
+    Pillow stores RGB as 4 bytes per pixel, so an RGBX raw buffer is mapped
+    directly, whereas a packed (h, w, 3) array is always unpacked into a copy.
+    The JPEG encoder ignores the pad byte.
+    """
+    h, w = arr.shape[:2]
+    return Image.frombuffer("RGBX", (w, h), arr, "raw", "RGBX", 0, 1)
 
-def save_jpeg_to_bytes(img: Image.Image, quality: int, subsampling: int = 0) -> bytes:
+def save_jpeg_to_bytes(img: Image.Image, quality: int, subsampling: int = 2) -> bytes:
     """
     Save PIL image to bytes in memory as JPEG with given quality.
     subsampling: 0 = 4:4:4 (no chroma subsampling), 1 = 4:2:2, 2 = 4:2:0
@@ -58,6 +94,42 @@ def save_jpeg_to_bytes(img: Image.Image, quality: int, subsampling: int = 0) ->
     img.save(buf, format="JPEG", quality=quality, optimize=True, subsampling=subsampling)
     return buf.getvalue()
 
+def encode_in_range(img: Image.Image, min_bytes: int, max_bytes: int, q_lo: int, q_hi: int, max_steps: int = 8) -> Tuple[bytes, int]:
+    """
+    Binary-search JPEG quality for an encoding of img between min_bytes and
+    max_bytes, stopping at the first in-range result (jpeg-recompress style).
+    Returns (data, size): the in-range encoding if one was found, otherwise
+    the attempt closest to the middle of the range.
+    """
+    target = (min_bytes + max_bytes) / 2
+    lo, hi = q_lo, q_hi
+    best_data = b""
+    best_bytes = None
+    for _ in range(max_steps):
+        q = (lo + hi) // 2
+        data = save_jpeg_to_bytes(img, quality=q)
+        size = len(data)
+
+        # Accept exact if in range
+        if min_bytes <= size <= max_bytes:
+            return data, size
+        # record closest below or above
+        if best_bytes is None or abs(size - target) < abs(best_bytes - target):
+            best_bytes = size
+            best_data = data
+
+        # adjust search
+        if size < min_bytes:
+            # output too small -> increase quality and/or increase scale
+            lo = min(q + 1, q_hi)
+        else:
+            # output too big -> decrease quality
+            hi = max(q - 1, q_lo)
+
+        if lo > hi:
+            break
+    return best_data, best_bytes
+
 def generate_one_image(path: Path, min_bytes: int, max_bytes: int, base_w: int, base_h: int) -> bool:
     """
     Try to generate one image that falls between min_bytes and max_bytes.
@@ -68,10 +140,13 @@ def generate_one_image(path: Path, min_bytes: int, max_bytes: int, base_w: int,
 
     # Start with base dimensions and a random seed for content
     scale = 1.0
-    quality_low, quality_high = 30, 95  # search quality between these
+    # 4:2:0 output is smaller per quality step than 4:4:4, so widen the range
+    # to keep MIN_MB..MAX_MB reachable
+    quality_low, quality_high = 20, 98  # search quality between these
     # We'll attempt to binary-search on quality, and if not enough, change scale
-    last_good_bytes = None
-    last_good_bytes_data = None
+    # closest out-of-range encoding seen across all attempts, kept as a fallback
+    target = (min_bytes + max_bytes) / 2
+    fallback_data = None
 
     # prepare a content seed to produce reproducible random pattern for this image
     content_seed = random.randint(0, 2**31 - 1)
@@ -85,47 +160,19 @@ def generate_one_image(path: Path, min_bytes: int, max_bytes: int, base_w: int,
         img = pil_image_from_array(arr)
 
         # Binary search on quality to reach the target size
-        lo, hi = quality_low, quality_high
-        best_bytes = None
-        best_data = None
-
-        for qs in range(0, 8):  # up to 8 iterations of binary search
-            q = (lo + hi) // 2
-            data = save_jpeg_to_bytes(img, quality=q)
-            size = len(data)
-
-            # Accept exact if in range
-            if min_bytes <= size <= max_bytes:
-                path.write_bytes(data)
-                return True
-            # record closest below or above
-            if best_bytes is None or abs(size - (min_bytes + max_bytes)/2) < abs(best_bytes - (min_bytes + max_bytes)/2):
-                best_bytes = size
-                best_data = data
-
-            # adjust search
-            if size < min_bytes:
-                # output too small -> increase quality and/or increase scale
-                lo = min(q + 1, quality_high)
-            else:
-                # output too big -> decrease quality
-                hi = max(q - 1, quality_low)
-
-            if lo > hi:
-                break
-
-        # After quality search, check best result
-        if best_data is not None:
-            if min_bytes <= best_bytes <= max_bytes:
-                path.write_bytes(best_data)
-                return True
-            # If best_bytes < min_bytes -> need bigger image: increase scale
-            if best_bytes < min_bytes:
-                # increase scale (but not huge)
-                scale *= 1.15 + random.uniform(0.0, 0.1)
-            else:
-                # best_bytes > max_bytes -> reduce scale if possible
-                scale *= 0.9 - random.uniform(0.0, 0.05)
+        best_data, best_bytes = encode_in_range(img, min_bytes, max_bytes, quality_low, quality_high)
+        if min_bytes <= best_bytes <= max_bytes:
+            path.write_bytes(best_data)
+            return True
+        if fallback_data is None or abs(best_bytes - target) < abs(len(fallback_data) - target):
+            fallback_data = best_data
+        # If best_bytes < min_bytes -> need bigger image: increase scale
+        if best_bytes < min_bytes:
+            # increase scale (but not huge)
+            scale *= 1.15 + random.uniform(0.0, 0.1)
+        else:
+            # best_bytes > max_bytes -> reduce scale if possible
+            scale *= 0.9 - random.uniform(0.0, 0.05)
 
         # Clamp scale to reasonable bounds
         if scale < 0.2:
@@ -134,10 +181,10 @@ def generate_one_image(path: Path, min_bytes: int, max_bytes: int, base_w: int,
             scale = 3.5
 
     # if we exit loop, we failed to produce valid size within attempts
-    # but we can write the closest attempt (best_data) if exists to avoid skipping
-    if last_good_bytes_data is not None:
+    # but we can write the closest attempt if exists to avoid skipping
+    if fallback_data is not None:
         try:
-            path.write_bytes(last_good_bytes_data)
+            path.write_bytes(fallback_data)
             return True
         except Exception:
             return False
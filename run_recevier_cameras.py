@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 import argparse
 import json
+import multiprocessing as mp
 import os
 import signal
-import subprocess
 import sys
+import time
 from typing import Dict, Tuple, List
 
+# Imported once here so every forked receiver starts from an interpreter that
+# already has the receiver module (and its dependencies) loaded.
+import pyfast_recv_v2
+
 
 def build_out_dir(camera_name: str, cfg: Dict[str, str]) -> str:
     dest_base = cfg.get("dest_path")
@@ -22,14 +27,10 @@ def main() -> int:
 
     base_dir = os.path.dirname(os.path.abspath(__file__))
     config_path = os.path.join(base_dir, "camera_config.json")
-    recv_script = os.path.join(base_dir, "pyfast_recv_v2.py")
 
     if not os.path.exists(config_path):
         print(f"Config not found: {config_path}", file=sys.stderr)
         return 1
-    if not os.path.exists(recv_script):
-        print(f"Receiver script not found: {recv_script}", file=sys.stderr)
-        return 1
 
     with open(config_path, "r", encoding="utf-8") as f:
         cameras: Dict[str, Dict[str, str]] = json.load(f)
@@ -38,11 +39,27 @@ def main() -> int:
     base_port = 50001
     workers = 32
 
-    processes: List[Tuple[str, int, subprocess.Popen]] = []
+    # Camera order, ports and the static part of each receiver argv are fixed
+    # for the lifetime of the service, so resolve them once up front.
+    static_args = ("--workers", str(workers), "--reuseport", "--verbose", "--use-dest-paths")
+    camera_specs: Tuple[Tuple[str, Dict[str, str], int, Tuple[str, ...]], ...] = tuple(
+        (
+            camera_name,
+            cfg,
+            base_port + idx,
+            ("--listen-ip", listen_ip, "--port", str(base_port + idx)),
+        )
+        for idx, (camera_name, cfg) in enumerate(sorted(cameras.items()))
+    )
+
+    # fork (not spawn/forkserver) is what lets children skip interpreter startup
+    # and re-importing pyfast_recv_v2; only its argv parsing runs per child.
+    ctx = mp.get_context("fork")
+    processes: List[Tuple[str, int, mp.process.BaseProcess]] = []
     
     # Start cameras immediately
     print("Starting camera receivers...")
-    for idx, (camera_name, cfg) in enumerate(sorted(cameras.items())):
+    for camera_name, cfg, port, argv_head in camera_specs:
         try:
             out_dir = build_out_dir(camera_name, cfg)
         except Exception as e:
@@ -50,22 +67,12 @@ def main() -> int:
             continue
 
         os.makedirs(out_dir, exist_ok=True)
-        port = base_port + idx
-
-        cmd = [
-            sys.executable or "python3",
-            recv_script,
-            "--listen-ip", listen_ip,
-            "--port", str(port),
-            "--out-dir", out_dir,
-            "--workers", str(workers),
-            "--reuseport",
-            "--verbose",
-            "--use-dest-paths"
-        ]
+
+        argv = [*argv_head, "--out-dir", out_dir, *static_args]
         print(f"Starting {camera_name} on {listen_ip}:{port} -> {out_dir}")
-        print("  ", " ".join(cmd))
-        p = subprocess.Popen(cmd)
+        print("   pyfast_recv_v2", " ".join(argv))
+        p = ctx.Process(target=pyfast_recv_v2.main, args=(argv,), name=f"recv-{camera_name}")
+        p.start()
         processes.append((camera_name, port, p))
 
     if not processes:
@@ -77,7 +84,7 @@ def main() -> int:
         while True:
             # Check if any processes have died and restart them if needed
             for camera_name, port, proc in list(processes):
-                rc = proc.poll()
+                rc = proc.exitcode
                 if rc is not None:
                     print(f"Receiver for {camera_name} on port {port} exited with code {rc}", file=sys.stderr)
                     processes.remove((camera_name, port, proc))
@@ -90,18 +97,25 @@ def main() -> int:
     except KeyboardInterrupt:
         pass
     finally:
-        # Clean up all processes
+        # Clean up all processes: signal everyone first, then wait against a
+        # single shared deadline so shutdown takes ~5s total rather than 5s per
+        # camera, and SIGKILL whatever is still alive in one final sweep.
         for camera_name, port, proc in processes:
             try:
                 proc.terminate()
             except Exception:
                 pass
+        deadline = time.monotonic() + 5
         for _, _, proc in processes:
             try:
-                proc.wait(timeout=5)
+                proc.join(timeout=max(0.0, deadline - time.monotonic()))
             except Exception:
+                pass
+        for _, _, proc in processes:
+            if proc.exitcode is None:
                 try:
                     proc.kill()
+                    proc.join()
                 except Exception:
                     pass
     return 0
@@ -1,33 +1,82 @@
 # python run_senders_from_config.py --zmq --dest-path "/mnt/bt3-disk-01/data_transfer_test/"
 #!/usr/bin/env python3
+import atexit
 import json
+import logging
+import logging.handlers
 import os
+import queue
 import subprocess
 import sys
-import argparse
 import threading
 import time
-import re
+import traceback
+import argparse
+import functools
+import multiprocessing
+import asyncio
 import zmq
+import zmq.asyncio
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import zstandard as zstd
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Every zstd frame starts with this magic; a JSON payload never does
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
 
 
+logger = logging.getLogger("run_senders_from_config")
+
+
+def setup_logging(level: int) -> None:
+    """
+    Route launcher messages through a queue so the stdout/stderr writes happen
+    on a listener thread instead of the trigger path; records are still
+    formatted by the caller (QueueHandler.prepare).
+    Messages below WARNING go to stdout, WARNING and above to stderr.
+    """
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.addFilter(lambda record: record.levelno < logging.WARNING)
+    stderr_handler = logging.StreamHandler(sys.stderr)
+    stderr_handler.setLevel(logging.WARNING)
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, stdout_handler, stderr_handler, respect_handler_level=True)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    listener.start()
+    # Flushes whatever is still queued on exit
+    atexit.register(listener.stop)
+
+
+@functools.lru_cache(maxsize=1)
 def parse_frame_info(frame_id: str) -> tuple[int, str, str, str]:
     """
     Parse frame_id supporting two formats and return (num, digits_str, scheme, camera_token).
     schemes:
       - 'camera_then_num': frame_<cameraToken>_<digits>.jpg
       - 'num_then_camera': frame_<digits>_<cameraToken>.jpg
+    Consecutive triggers usually repeat the same frame_id, so the last result is cached.
     """
-    # Pattern A: frame_camera09_000000000.jpg
-    m = re.match(r"^frame_([^_]+)_(\d+)\.jpg$", frame_id)
-    if m:
-        camera_token, digits = m.group(1), m.group(2)
-        return int(digits), digits, "camera_then_num", camera_token
-    # Pattern B: frame_000000_camera01.jpg
-    m = re.match(r"^frame_(\d+)_([^_]+)\.jpg$", frame_id)
-    if m:
-        digits, camera_token = m.group(1), m.group(2)
-        return int(digits), digits, "num_then_camera", camera_token
+    if frame_id.startswith("frame_") and frame_id.endswith(".jpg"):
+        first, sep, second = frame_id[6:-4].partition("_")
+        # Exactly one '_' between two non-empty tokens
+        if sep and first and second and "_" not in second:
+            # Pattern A: frame_camera09_000000000.jpg
+            if second.isdecimal():
+                return int(second), second, "camera_then_num", first
+            # Pattern B: frame_000000_camera01.jpg
+            if first.isdecimal():
+                return int(first), first, "num_then_camera", second
     raise ValueError(f"Invalid frame_id format: {frame_id}")
 
 
@@ -45,26 +94,204 @@ def extract_camera_name_from_src_dir(src_dir: str) -> str:
     return os.path.basename(os.path.normpath(src_dir))
 
 
+@functools.lru_cache(maxsize=1024)
 def construct_dest_path(camera_dest_path: str, ball_id: str, camera_name: str) -> str:
     """Construct destination path as camera_dest_path/ball_id/camera_name."""
     if not camera_dest_path:
         return ""
-    return os.path.join(camera_dest_path, ball_id, camera_name).replace('\\', '/')
+    dest_path = os.path.join(camera_dest_path, ball_id, camera_name)
+    return dest_path.replace(os.sep, '/') if os.sep != '/' else dest_path
+
+
+def use_pidfd_child_watcher() -> None:
+    """On Python < 3.12, make asyncio wait on sender children through pidfds.
+
+    The 3.11 default (ThreadedChildWatcher) starts one thread per child just to
+    block in waitpid(); PidfdChildWatcher instead registers each child's pidfd
+    with the event loop's selector, so an exit wakes the loop directly. 3.12+
+    already picks pidfds on Linux, and kernels older than 5.3 keep the default.
+    """
+    if sys.version_info >= (3, 12) or not hasattr(asyncio, "PidfdChildWatcher"):
+        return
+    try:
+        os.close(os.pidfd_open(os.getpid()))
+    except (AttributeError, OSError):
+        return
+    asyncio.set_child_watcher(asyncio.PidfdChildWatcher())
+
+
+def pool_send(argv: list, deadline: float) -> int:
+    """Run one sender in a --warm-pool worker.
+
+    A sender waiting on a receiver that never ACKs cannot be interrupted, so
+    once the launcher's deadline (time.monotonic(), 0 = none) passes the whole
+    worker exits; the pool starts a fresh one in its slot.
+    """
+    if not deadline:
+        return _pool_sender_main(argv)
+    remaining = deadline - time.monotonic()
+    if remaining <= 0:
+        # Sat in the pool queue until the launcher gave up on it
+        return 1
+    watchdog = threading.Timer(remaining, os._exit, (1,))
+    watchdog.daemon = True
+    watchdog.start()
+    try:
+        return _pool_sender_main(argv)
+    finally:
+        watchdog.cancel()
+
+
+def _pool_sender_main(argv: list) -> int:
+    # Only pool workers need the sender as a module (the forkserver preloads
+    # it); other modes run it as a script, checked for in main()
+    import pyfast_send_aftername_v2
+
+    # Pool reports Exceptions through error_callback, but anything else ends
+    # the worker without a result and the launch would wait forever. Turn it
+    # into an exit code, as a sender subprocess would.
+    try:
+        return pyfast_send_aftername_v2.main(argv)
+    except SystemExit as e:
+        if e.code is None:
+            return 0
+        if isinstance(e.code, int):
+            return e.code
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        raise
+    except BaseException:
+        traceback.print_exc()
+        return 1
+
+
+class TriggerScheduler:
+    """
+    Per-ball_id launch scheduling for --zmq-sub.
+
+    At most one launch runs per ball_id; triggers arriving meanwhile collapse
+    into a single pending slot that keeps the highest frame number and runs
+    once the current launch ends. A trigger identical to one that launched
+    successfully less than dedupe_secs ago is skipped, including a retry that
+    arrived while that launch was still running. Failed launches are not
+    remembered, so their retries go through.
+
+    launch is an async callable taking the trigger tuple
+    (ball_id, num, suffix, scheme, dragonfly_key, side) and returning an rc.
+    """
+
+    def __init__(self, launch, dedupe_secs: float = 0.0, coalesce_ms: float = 0.0):
+        self.launch = launch
+        self.dedupe_secs = dedupe_secs
+        self.coalesce_ms = coalesce_ms
+        self.pending = {}
+        self.inflight = {}
+        # Completion times of the last few successful triggers
+        self.recent = {}
+
+    def is_duplicate(self, trigger: tuple) -> bool:
+        done_at = self.recent.get(trigger)
+        return done_at is not None and asyncio.get_running_loop().time() - done_at < self.dedupe_secs
+
+    def submit(self, trigger: tuple) -> None:
+        ball_id, num = trigger[0], trigger[1]
+        if self.is_duplicate(trigger):
+            logger.info(f"[zmq-sub] duplicate trigger for ball_id={ball_id}, start-after={trigger[2]} within {self.dedupe_secs}s; skipped")
+            return
+        prev = self.pending.get(ball_id)
+        if prev is not None:
+            logger.info(f"[zmq-sub] coalescing trigger for ball_id={ball_id} with one already pending")
+        if prev is None or num > prev[1]:
+            self.pending[ball_id] = trigger
+        if ball_id not in self.inflight:
+            self.inflight[ball_id] = asyncio.create_task(self._run_ball(ball_id))
+
+    async def _run_ball(self, ball_id: str) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while ball_id in self.pending:
+                if self.coalesce_ms > 0:
+                    await asyncio.sleep(self.coalesce_ms / 1000.0)
+                trigger = self.pending.pop(ball_id)
+                _, _, suffix, scheme, dragonfly_key, side = trigger
+                # A retry queued while the same trigger was launching
+                if self.is_duplicate(trigger):
+                    logger.info(f"[zmq-sub] duplicate trigger for ball_id={ball_id}, start-after={suffix} already launched; skipped")
+                    continue
+                logger.info(f"[zmq-sub] launching senders start-after suffix={suffix}, ball_id={ball_id}, scheme={scheme}, dragonfly_key={dragonfly_key}, side={side}")
+                try:
+                    rc = await self.launch(trigger)
+                except Exception as e:
+                    logger.error(f"[zmq-sub] error: {e}")
+                    rc = 1
+                if rc == 0:
+                    self.recent.pop(trigger, None)
+                    self.recent[trigger] = loop.time()
+                    if len(self.recent) > 16:
+                        del self.recent[next(iter(self.recent))]
+                    logger.info(f"[zmq-sub] SUCCESS: launched with start-after={suffix}, ball_id={ball_id}")
+                # else:
+                #     print(f"[zmq-sub] ERROR: one or more senders failed (rc={rc})")
+        finally:
+            self.inflight.pop(ball_id, None)
 
 
 def main() -> int:
     ap = argparse.ArgumentParser(description="Launch multiple senders from camera_config.json")
     ap.add_argument("--detach", action="store_true", help="Start senders in background and exit immediately")
     ap.add_argument("--timeout-secs", type=float, default=0.0, help="For threaded (non-detach) mode: max seconds to run before stopping (0 = no timeout)")
+    ap.add_argument("--sender-server", action="store_true", help="Start one long-lived sender per camera at startup and hand each trigger to it over a Unix socket instead of starting a new process")
+    ap.add_argument("--sender-socket-dir", type=str, default="/tmp", help="Directory for the --sender-server Unix sockets (sender_<camera>.sock)")
+    ap.add_argument("--verbose-launch", action="store_true", help="Print the per-camera destination and full sender command on every launch")
+    ap.add_argument("--quiet", action="store_true", help="Only print warnings and errors")
+    ap.add_argument("--warm-pool", action="store_true", help="Run senders in a persistent pool of pre-imported worker processes instead of starting a new interpreter per camera per trigger (a sender still running at --timeout-secs exits with its worker, which the pool replaces)")
     # PUB/SUB mode only
     ap.add_argument("--zmq-sub", action="store_true", help="Run a ZMQ SUB client to trigger senders from published payloads")
     ap.add_argument("--zmq-sub-endpoint", type=str, default="tcp://127.0.0.1:5876", help="ZMQ SUB endpoint to connect to (e.g., tcp://<host>:<port>)")
     ap.add_argument("--zmq-sub-topic", type=str, default="", help="Optional topic to subscribe to (empty subscribes to all)")
+    ap.add_argument("--rcv-hwm", type=int, default=10000, help="ZMQ receive high-water mark (queued messages) for the SUB socket")
+    ap.add_argument("--dedupe-secs", type=float, default=2.0, help="Skip a trigger identical to one launched less than this many seconds ago (0 = never skip)")
+    ap.add_argument("--conflate", action="store_true", help="Keep only the newest queued message on the SUB socket (ZMQ_CONFLATE); older triggers for any ball_id are dropped. Single-part publishers only")
+    ap.add_argument("--coalesce-ms", type=float, default=0.0, help="Wait this long before launching a trigger; triggers for the same ball_id arriving meanwhile (or during its running launch) collapse to the highest frame")
     # Forwarding (PUB) options
     ap.add_argument("--forward-pub", action="store_true", help="Enable forwarding of received triggers to other machines via PUB")
     ap.add_argument("--forward-bind", type=str, default="tcp://*:5876", help="PUB bind endpoint used to forward triggers (e.g., tcp://*:5876)")
+    ap.add_argument("--forward-ipc-path", type=str, default="", help="Also bind the forwarder PUB on ipc://<path> for subscribers on the same host (e.g., /tmp/trigger_fwd.sock; must differ from the upstream publisher's IPC path)")
     ap.add_argument("--forward-topic", type=str, default="", help="Optional PUB topic when forwarding (empty sends raw JSON only)")
+    ap.add_argument("--forward-compress", choices=("none", "zstd"), default="none", help="Compress forwarded payloads (zstd helps on bandwidth-limited WAN links; needs the zstandard package)")
+    ap.add_argument("--zstd-dict", type=str, default="", help="Optional zstd dictionary file used to compress forwarded payloads and decompress received ones (must match on both sides)")
+    ap.add_argument("--snd-hwm", type=int, default=10000, help="ZMQ send high-water mark (queued messages per subscriber) for the forwarder PUB socket")
     args = ap.parse_args()
+    setup_logging(logging.WARNING if args.quiet else logging.DEBUG if args.verbose_launch else logging.INFO)
+    if args.sender_server and (args.detach or args.warm_pool):
+        print("--sender-server cannot be combined with --detach or --warm-pool", file=sys.stderr)
+        return 1
+    # A second ipc bind silently takes the path over, so the launcher would
+    # end up subscribed to its own forward
+    if args.forward_ipc_path and args.zmq_sub_endpoint == f"ipc://{args.forward_ipc_path}":
+        print("--forward-ipc-path must differ from the --zmq-sub-endpoint IPC path", file=sys.stderr)
+        return 1
+    if args.conflate and (args.forward_pub or args.zmq_sub_topic):
+        print("--conflate keeps only the newest single-part message; it cannot be combined with --forward-pub or --zmq-sub-topic", file=sys.stderr)
+        return 1
+
+    # Compressed triggers from an upstream forwarder are decoded whenever
+    # zstandard is installed; compressing the forward path is opt-in
+    if (args.forward_compress == "zstd" or args.zstd_dict) and not ZSTD_AVAILABLE:
+        print("zstd compression requested but the zstandard package is not installed", file=sys.stderr)
+        return 1
+    zstd_dict = None
+    if args.zstd_dict:
+        try:
+            with open(args.zstd_dict, "rb") as f:
+                zstd_dict = zstd.ZstdCompressionDict(f.read())
+        except OSError as e:
+            print(f"Cannot read zstd dictionary {args.zstd_dict}: {e}", file=sys.stderr)
+            return 1
+    zstd_cctx = zstd.ZstdCompressor(level=3, dict_data=zstd_dict) if args.forward_compress == "zstd" else None
+    zstd_dctx = zstd.ZstdDecompressor(dict_data=zstd_dict) if ZSTD_AVAILABLE else None
+
     base_dir = os.path.dirname(os.path.abspath(__file__))
     config_path = os.path.join(base_dir, "camera_config.json")
     sender_path = os.path.join(base_dir, "pyfast_send_aftername_v2.py")
@@ -76,6 +303,7 @@ def main() -> int:
         print(f"Sender script not found: {sender_path}", file=sys.stderr)
         return 1
 
+    config_mtime = os.stat(config_path).st_mtime_ns
     with open(config_path, "r", encoding="utf-8") as f:
         cameras = json.load(f)
 
@@ -89,218 +317,376 @@ def main() -> int:
     stable_passes = 1
     max_files = 899
 
-    def launch_senders_with_suffix(start_after_suffix: str, ball_id: str = "", scheme: str = "camera_then_num", dragonfly_key: str = "", side: str = "") -> int:
-        # Launch one sender per camera concurrently on distinct ports
-        procs = []
-        threads = []
-        results = {}
-        proc_map = {}
+    # Created once, before the trigger loop, so interpreter startup and the
+    # sender import are paid once rather than on every trigger. forkserver
+    # workers come from a clean server process with the sender preloaded,
+    # not from this zmq-holding launcher.
+    pool = None
+    if args.warm_pool and not args.detach:
+        mp_context = multiprocessing.get_context("forkserver")
+        mp_context.set_forkserver_preload(["pyfast_send_aftername_v2"])
+        # multiprocessing.Pool rather than ProcessPoolExecutor: a worker that
+        # exits mid-task is replaced instead of breaking the pool, and
+        # terminate() does not wait on senders that are stuck
+        pool = mp_context.Pool(processes=max(1, len(cameras)))
 
-        def run_sender_thread(cam_name: str, port: int, cmd: list) -> None:
-            p = subprocess.Popen(cmd)
-            proc_map[(cam_name, port)] = p
-            rc = p.wait()
-            results[(cam_name, port)] = rc
+    # Everything that does not depend on the trigger is resolved once here, so
+    # a trigger only has to fill in the start-after name and the ball_id.
+    const_args = (
+        "--pattern", pattern,
+        "--conns", str(conns),
+        "--lookahead", str(lookahead),
+        "--stable-ms", str(stable_ms),
+        "--stable-passes", str(stable_passes),
+        "--max-files", str(max_files),
+        "--once",
+        "--cleanup-part-files",
+    )
 
+    def build_camera_specs(cameras: dict) -> tuple:
+        specs = []
         for idx, (cam_name, cfg) in enumerate(sorted(cameras.items())):
             src_dir = cfg.get("src")
             if not src_dir:
-                print(f"Skipping {cam_name}: missing 'src' in config", file=sys.stderr)
+                logger.warning(f"[config] skipping {cam_name}: missing 'src' in config")
                 continue
 
             # Get destination path from config
             camera_dest_path = cfg.get("dest_path", "")
             if not camera_dest_path:
-                print(f"Skipping {cam_name}: missing 'dest_path' in config", file=sys.stderr)
+                logger.warning(f"[config] skipping {cam_name}: missing 'dest_path' in config")
                 continue
 
-            # Derive start-after based on incoming frame_id scheme
-            if scheme == "camera_then_num":
-                start_after = f"frame_{cam_name}_{start_after_suffix}.jpg"
-            else:  # num_then_camera
-                start_after = f"frame_{start_after_suffix}_{cam_name}.jpg"
             port = base_port + idx
-
-            # Construct destination path
             camera_name = extract_camera_name_from_src_dir(src_dir)
-            dest_path = construct_dest_path(camera_dest_path, ball_id, camera_name)
-            
-            print(f"[config] {camera_name}, {ball_id}")
-            print(f"[config] {cam_name}: src={src_dir} -> dest={dest_path}")
-
-            cmd = [
+            base_cmd = (
                 sys.executable,
                 sender_path,
                 "--src-dir", src_dir,
-                "--start-after", start_after,
                 "--host", host,
                 "--port", str(port),
-                "--pattern", pattern,
-                "--conns", str(conns),
-                "--lookahead", str(lookahead),
-                "--stable-ms", str(stable_ms),
-                "--stable-passes", str(stable_passes),
-                "--max-files", str(max_files),
-                "--once",
-                "--cleanup-part-files",
-            ]
-            
-            # Add destination path (always provided from config)
-            print(f"[DEST] {cam_name}: Frames will be copied to: {dest_path}/<filename>")
-            example_name = (
-                f"frame_{cam_name}_{start_after_suffix}.jpg" if scheme == "camera_then_num" else f"frame_{start_after_suffix}_{cam_name}.jpg"
+                *const_args,
             )
-            print(f"[DEST] Example: {dest_path}/{example_name}")
-            cmd.extend(["--dest-path", dest_path])
-            
+            specs.append((cam_name, port, src_dir, camera_name, camera_dest_path, base_cmd))
+        return tuple(specs)
+
+    camera_specs = build_camera_specs(cameras)
+
+    def refresh_camera_specs() -> None:
+        # Edits to camera_config.json apply from the next trigger without a
+        # restart; that costs one stat() per trigger, and the file is only
+        # re-read when its mtime moves
+        nonlocal camera_specs, config_mtime
+        try:
+            mtime = os.stat(config_path).st_mtime_ns
+        except OSError as e:
+            logger.error(f"[config] cannot stat {config_path}: {e}; keeping the loaded cameras")
+            return
+        if mtime == config_mtime:
+            return
+        if args.sender_server:
+            config_mtime = mtime
+            logger.warning(f"[config] {config_path} changed; restart to apply it to the running --sender-server senders")
+            return
+        try:
+            with open(config_path, "rb") as f:
+                data = f.read()
+            cameras = orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+        except (OSError, ValueError) as e:
+            # mtime stays unrecorded, so the next trigger retries (e.g. after a half-written save)
+            logger.error(f"[config] cannot reload {config_path}: {e}; keeping the loaded cameras")
+            return
+        config_mtime = mtime
+        camera_specs = build_camera_specs(cameras)
+        logger.info(f"[config] reloaded {config_path}: {len(camera_specs)} cameras")
+
+    # Long-lived per-camera senders: started once here, then each trigger is
+    # a JSON line on the camera's Unix socket instead of a new process
+    server_socks = {}
+    server_procs = []
+    if args.sender_server:
+        for cam_name, port, src_dir, camera_name, camera_dest_path, base_cmd in camera_specs:
+            sock_path = os.path.join(args.sender_socket_dir, f"sender_{cam_name}.sock")
+            server_socks[cam_name] = sock_path
+            cmd = [*base_cmd, "--server", sock_path]
+            logger.info(f"[sender-server] {cam_name}: starting sender on {sock_path}")
+            server_procs.append(subprocess.Popen(cmd))
+
+    def stop_workers() -> None:
+        if pool is not None:
+            pool.terminate()
+        for p in server_procs:
+            p.terminate()
+        for p in server_procs:
+            try:
+                p.wait(timeout=5.0)
+            except subprocess.TimeoutExpired:
+                p.kill()
+
+    async def launch_senders_with_suffix(start_after_suffix: str, ball_id: str = "", scheme: str = "camera_then_num", dragonfly_key: str = "", side: str = "") -> int:
+        # Launch one sender per camera concurrently on distinct ports
+        refresh_camera_specs()
+        # Held for the whole launch, so a reload by another ball's trigger
+        # cannot shift the indices below
+        specs = camera_specs
+        # Indexed like specs
+        loop = asyncio.get_running_loop()
+        procs = [None] * len(specs)
+        tasks = [None] * len(specs)
+        deadline = time.monotonic() + args.timeout_secs if args.timeout_secs else 0.0
+
+        async def launch_one(idx: int, cmd: list) -> int:
+            p = procs[idx] = await asyncio.create_subprocess_exec(*cmd)
+            return await p.wait()
+
+        def pool_task(argv: list) -> asyncio.Future:
+            fut = loop.create_future()
+
+            def settle(outcome) -> None:
+                # Already cancelled if the launcher timed out first
+                if fut.done():
+                    return
+                if isinstance(outcome, BaseException):
+                    fut.set_exception(outcome)
+                else:
+                    fut.set_result(outcome)
+
+            def post(outcome) -> None:
+                # Runs on the pool's result-handler thread
+                try:
+                    loop.call_soon_threadsafe(settle, outcome)
+                except RuntimeError:
+                    pass  # loop already closed during shutdown
+
+            pool.apply_async(pool_send, (argv, deadline), callback=post, error_callback=post)
+            return fut
+
+        async def request_one(cam_name: str, sock_path: str, request: dict) -> int:
+            # The server may still be starting up on the first trigger
+            for _ in range(100):
+                try:
+                    reader, writer = await asyncio.open_unix_connection(sock_path)
+                    break
+                except (FileNotFoundError, ConnectionRefusedError):
+                    await asyncio.sleep(0.1)
+            else:
+                logger.error(f"[sender-server] {cam_name}: no sender listening on {sock_path}")
+                return 1
+            try:
+                writer.write(json.dumps(request).encode("utf-8") + b"\n")
+                reply = await reader.readline()
+            finally:
+                writer.close()
+            if not reply:
+                logger.error(f"[sender-server] {cam_name}: sender closed the connection without a reply")
+                return 1
+            return json.loads(reply).get("rc", 1)
+
+        for idx, (cam_name, port, src_dir, camera_name, camera_dest_path, base_cmd) in enumerate(specs):
+            # Derive start-after based on incoming frame_id scheme
+            if scheme == "camera_then_num":
+                start_after = f"frame_{cam_name}_{start_after_suffix}.jpg"
+            else:  # num_then_camera
+                start_after = f"frame_{start_after_suffix}_{cam_name}.jpg"
+            dest_path = construct_dest_path(camera_dest_path, ball_id, camera_name)
+
+            # Add destination path (always provided from config). Trigger
+            # values go in --opt=value form so one starting with '-' is not
+            # taken for an option.
+            cmd = [*base_cmd, f"--start-after={start_after}", f"--dest-path={dest_path}"]
+
             # Add dragonfly_key and side if provided
             if dragonfly_key:
-                cmd.extend(["--dragonfly-key", dragonfly_key])
+                cmd.append(f"--dragonfly-key={dragonfly_key}")
             if side:
-                cmd.extend(["--side", side])
-            
-            print("Starting:", " ".join(cmd))
+                cmd.append(f"--side={side}")
+
+            if args.verbose_launch:
+                logger.debug(f"[config] {camera_name}, {ball_id}")
+                logger.debug(f"[config] {cam_name}: src={src_dir} -> dest={dest_path}")
+                logger.debug(f"[DEST] {cam_name}: Frames will be copied to: {dest_path}/<filename>")
+                logger.debug(f"[DEST] Example: {dest_path}/{start_after}")
+                logger.debug("Starting: " + " ".join(cmd))
+
             if args.detach:
                 # Start in a new session so children survive if this launcher exits
-                p = subprocess.Popen(cmd, preexec_fn=os.setsid)
-                procs.append((cam_name, port, p))
+                procs[idx] = subprocess.Popen(cmd, start_new_session=True)
+            elif args.sender_server:
+                request = {"start_after": start_after, "dest_path": dest_path, "dragonfly_key": dragonfly_key, "side": side}
+                tasks[idx] = asyncio.create_task(request_one(cam_name, server_socks[cam_name], request))
+            elif pool is not None:
+                # Same argv as the subprocess, minus interpreter and script path
+                tasks[idx] = pool_task(cmd[2:])
             else:
-                t = threading.Thread(target=run_sender_thread, args=(cam_name, port, cmd), daemon=False)
-                t.start()
-                threads.append(t)
+                tasks[idx] = asyncio.create_task(launch_one(idx, cmd))
 
         if args.detach:
-            for cam_name, port, p in procs:
-                print(f"Started {cam_name} on port {port} with PID {p.pid}")
+            for (cam_name, port, *_), p in zip(specs, procs):
+                logger.info(f"Started {cam_name} on port {port} with PID {p.pid}")
             return 0
 
-        # Wait for threads to finish (with optional timeout)
-        if args.timeout_secs > 0:
-            # Wait for up to timeout for threads to finish
-            end_time = time.time() + args.timeout_secs
-            for t in threads:
-                remaining = end_time - time.time()
-                if remaining <= 0:
-                    break
-                t.join(timeout=max(0.0, remaining))
-            
-            # If any threads are still alive after timeout, terminate their processes
-            still_alive = [t for t in threads if t.is_alive()]
-            if still_alive:
-                print(f"[timeout] {len(still_alive)} threads still running after {args.timeout_secs}s timeout, terminating processes...", file=sys.stderr)
-                for (cam_name, port), p in list(proc_map.items()):
-                    if p.poll() is None:
-                        try:
-                            p.terminate()
-                        except Exception:
-                            pass
-                # Give a brief grace period, then kill if necessary
-                grace_deadline = time.time() + 1.0
-                for (cam_name, port), p in list(proc_map.items()):
-                    if p.poll() is None:
-                        remaining = grace_deadline - time.time()
-                        if remaining > 0:
-                            try:
-                                p.wait(timeout=remaining)
-                            except Exception:
-                                pass
-                    if p.poll() is None:
+        if not tasks:
+            return 0
+
+        _, not_done = await asyncio.wait(tasks, timeout=args.timeout_secs or None)
+        if not_done:
+            if pool is not None:
+                # pool_send enforces the same deadline inside each worker
+                logger.warning(f"[timeout] {len(not_done)} senders still running after {args.timeout_secs}s timeout; their pool workers exit and are replaced")
+                for f in not_done:
+                    f.cancel()
+                return 1
+            if args.sender_server:
+                logger.warning(f"[timeout] {len(not_done)} senders still running after {args.timeout_secs}s timeout; sender servers are left to finish")
+                for f in not_done:
+                    f.cancel()
+                return 1
+            logger.warning(f"[timeout] {len(not_done)} senders still running after {args.timeout_secs}s timeout, terminating processes...")
+            for p in procs:
+                if p is not None and p.returncode is None:
+                    try:
+                        p.terminate()
+                    except ProcessLookupError:
+                        pass
+            # Give a brief grace period, then kill if necessary
+            _, not_done = await asyncio.wait(not_done, timeout=1.0)
+            if not_done:
+                for p in procs:
+                    if p is not None and p.returncode is None:
                         try:
                             p.kill()
-                        except Exception:
+                        except ProcessLookupError:
                             pass
-                # Ensure threads exit after process termination
-                for t in still_alive:
-                    t.join(timeout=0.5)
-        else:
-            # No timeout - wait for all threads to finish naturally
-            for t in threads:
-                t.join()
-
-        if results:
-            failed = [(cam, port, rc) for (cam, port), rc in results.items() if rc != 0]
-            if failed:
-                # for cam_name, port, rc in failed:
-                #     print(f"Command failed for {cam_name} on port {port} with exit code {rc}", file=sys.stderr)
-                return 1
+                await asyncio.wait(not_done)
+
+        failed = []
+        for (cam_name, port, *_), task in zip(specs, tasks):
+            try:
+                rc = task.result()
+            except Exception as e:
+                logger.error(f"[launch] sender for {cam_name} on port {port} raised: {e!r}")
+                rc = 1
+            if rc != 0:
+                failed.append((cam_name, port, rc))
+        if failed:
+            # for cam_name, port, rc in failed:
+            #     print(f"Command failed for {cam_name} on port {port} with exit code {rc}", file=sys.stderr)
+            return 1
 
         return 0
 
-    if args.zmq_sub:
-        context = zmq.Context()
+    async def run_zmq_sub() -> int:
+        context = zmq.asyncio.Context()
         socket = context.socket(zmq.SUB)
+        # Socket options only apply to connections made after they are set
+        socket.setsockopt(zmq.RCVHWM, args.rcv_hwm)
+        socket.setsockopt(zmq.LINGER, 0)
+        socket.setsockopt(zmq.TCP_KEEPALIVE, 1)
+        socket.setsockopt(zmq.TCP_KEEPALIVE_IDLE, 30)
+        if args.conflate:
+            socket.setsockopt(zmq.CONFLATE, 1)
         connect_addr = args.zmq_sub_endpoint
         socket.connect(connect_addr)
         # Topic subscription (empty string subscribes to all)
         topic = args.zmq_sub_topic.encode("utf-8") if isinstance(args.zmq_sub_topic, str) else args.zmq_sub_topic
         socket.setsockopt(zmq.SUBSCRIBE, topic)
-        print(f"[zmq-sub] Subscribed to '{args.zmq_sub_topic}' on {connect_addr}")
+        logger.info(f"[zmq-sub] Subscribed to '{args.zmq_sub_topic}' on {connect_addr}")
         # Allow time for subscription to propagate
-        time.sleep(0.2)
-        print("[zmq-sub] Waiting for published messages (JSON with frame_id, ball_id)...")
+        await asyncio.sleep(0.2)
+        logger.info("[zmq-sub] Waiting for published messages (JSON with frame_id, ball_id)...")
         # Optional forwarder PUB socket
         pub_socket = None
         if args.forward_pub:
             pub_socket = context.socket(zmq.PUB)
+            # A slow subscriber past SNDHWM has messages dropped rather than stalling the others
+            pub_socket.setsockopt(zmq.SNDHWM, args.snd_hwm)
+            pub_socket.setsockopt(zmq.LINGER, 0)
+            pub_socket.setsockopt(zmq.TCP_KEEPALIVE, 1)
+            pub_socket.setsockopt(zmq.TCP_KEEPALIVE_IDLE, 30)
             pub_socket.bind(args.forward_bind)
-            print(f"[forward] PUB bound on {args.forward_bind} (topic='{args.forward_topic}')")
+            # Local subscribers can connect over IPC and skip the TCP/IP stack
+            if args.forward_ipc_path:
+                pub_socket.bind(f"ipc://{args.forward_ipc_path}")
+            forward_topic_bytes = args.forward_topic.encode("utf-8")
+            logger.info(f"[forward] PUB bound on {args.forward_bind} (topic='{args.forward_topic}')")
+            if args.forward_ipc_path:
+                logger.info(f"[forward] PUB also bound on ipc://{args.forward_ipc_path}")
+
+        async def parse_trigger(parts: list):
+            """Forward one received message, validate it, and return
+            (ball_id, num, suffix, scheme, dragonfly_key, side), or None if it
+            should not launch anything."""
+            # Support both single-part (raw JSON) and multipart ([topic, json]) publishers
+            if len(parts) == 1:
+                payload_bytes = parts[0]
+                topic_str = None
+            else:
+                topic_str = parts[0].decode("utf-8", errors="ignore")
+                payload_bytes = parts[-1]
+            # Forward to others if enabled. This relays the received bytes
+            # (zstd-compressed with --forward-compress) before any local
+            # parsing; subscribers run the same validation on their side.
+            is_compressed = payload_bytes[:4] == ZSTD_MAGIC
+            if pub_socket is not None:
+                try:
+                    # Already-compressed payloads from an upstream forwarder go out as received
+                    out_bytes = zstd_cctx.compress(payload_bytes) if zstd_cctx is not None and not is_compressed else payload_bytes
+                    if args.forward_topic:
+                        await pub_socket.send_multipart([forward_topic_bytes, out_bytes], copy=False)
+                    else:
+                        await pub_socket.send(out_bytes, copy=False)
+                    logger.info("[forward] published trigger to subscribers")
+                except Exception as fe:
+                    logger.error(f"[forward] publish error: {fe}")
+            try:
+                if is_compressed:
+                    if zstd_dctx is None:
+                        raise ValueError("zstd-compressed payload but the zstandard package is not installed")
+                    payload_bytes = zstd_dctx.decompress(payload_bytes)
+                # Both parsers take the raw bytes, so there is no separate UTF-8 decode
+                data = orjson.loads(payload_bytes) if ORJSON_AVAILABLE else json.loads(payload_bytes)
+            except Exception as e:
+                logger.warning(f"[zmq-sub] invalid message: {e}")
+                return None
+            logger.info(f"[zmq-sub] received{f' topic={topic_str}' if topic_str else ''}: {data}")
+            # Ignore if capture is stopped
+            if isinstance(data, dict) and data.get("isStopped") is True:
+                logger.info("[zmq-sub] IGNORED: isStopped True; no action taken")
+                return None
+            if not isinstance(data, dict) or "frame_id" not in data:
+                logger.warning("[zmq-sub] ERROR: missing 'frame_id'")
+                return None
+            frame_id = data.get("frame_id", "")
+            ball_id = data.get("ball_id", "default")
+            dragonfly_key = data.get("dragonfly_key", data.get("dragonflykey", ""))
+            side = data.get("side", "")
+            try:
+                num, digits_str, scheme, _ = parse_frame_info(frame_id)
+            except ValueError as e:
+                logger.warning(f"[zmq-sub] ERROR: {e}")
+                return None
+            suffix = digits_str  # preserve zero-padding width from source
+            return ball_id, num, suffix, scheme, dragonfly_key, side
+
+        # Launches run as tasks so receiving (and forwarding) never waits on
+        # sender processes
+        scheduler = TriggerScheduler(
+            lambda t: launch_senders_with_suffix(t[2], t[0], t[3], t[4], t[5]),
+            dedupe_secs=args.dedupe_secs,
+            coalesce_ms=args.coalesce_ms,
+        )
+
         try:
             while True:
                 try:
-                    # Support both single-part (raw JSON) and multipart ([topic, json]) publishers
-                    parts = socket.recv_multipart()
-                    if len(parts) == 1:
-                        payload_bytes = parts[0]
-                        topic_str = None
-                    else:
-                        topic_str = parts[0].decode("utf-8", errors="ignore")
-                        payload_bytes = parts[-1]
-                    try:
-                        msg_str = payload_bytes.decode("utf-8")
-                        data = json.loads(msg_str)
-                    except Exception as e:
-                        print(f"[zmq-sub] invalid message: {e}")
-                        continue
-                    print(f"[zmq-sub] received{f' topic={topic_str}' if topic_str else ''}: {data}")
-                    # Ignore if capture is stopped
-                    if isinstance(data, dict) and data.get("isStopped") is True:
-                        print("[zmq-sub] IGNORED: isStopped True; no action taken")
-                        continue
-                    if not isinstance(data, dict) or "frame_id" not in data:
-                        print("[zmq-sub] ERROR: missing 'frame_id'")
-                        continue
-                    frame_id = data.get("frame_id", "")
-                    ball_id = data.get("ball_id", "default")
-                    dragonfly_key = data.get("dragonfly_key", data.get("dragonflykey", ""))
-                    side = data.get("side", "")
-                    try:
-                        num, digits_str, scheme, _ = parse_frame_info(frame_id)
-                    except ValueError as e:
-                        print(f"[zmq-sub] ERROR: {e}")
+                    # CONFLATE does not support multipart messages
+                    parts = [await socket.recv()] if args.conflate else await socket.recv_multipart()
+                    trigger = await parse_trigger(parts)
+                    if trigger is None:
                         continue
-                    suffix = digits_str  # preserve zero-padding width from source
-                    print(f"[zmq-sub] launching senders start-after suffix={suffix}, ball_id={ball_id}, scheme={scheme}, dragonfly_key={dragonfly_key}, side={side}")
-                    # Forward to others if enabled
-                    if pub_socket is not None:
-                        try:
-                            forward_payload = json.dumps(data)
-                            if args.forward_topic:
-                                pub_socket.send_multipart([args.forward_topic.encode("utf-8"), forward_payload.encode("utf-8")])
-                            else:
-                                pub_socket.send_string(forward_payload)
-                            print("[forward] published trigger to subscribers")
-                        except Exception as fe:
-                            print(f"[forward] publish error: {fe}")
-                    rc = launch_senders_with_suffix(suffix, ball_id, scheme, dragonfly_key, side)
-                    if rc == 0:
-                        print(f"[zmq-sub] SUCCESS: launched with start-after={suffix}, ball_id={ball_id}")
-                    else:
-                        pass
-                        # print(f"[zmq-sub] ERROR: one or more senders failed (rc={rc})")
-                except KeyboardInterrupt:
-                    break
+                    scheduler.submit(trigger)
                 except Exception as e:
-                    print(f"[zmq-sub] error: {e}")
+                    logger.error(f"[zmq-sub] error: {e}")
         finally:
             try:
                 socket.close(0)
@@ -308,12 +694,23 @@ def main() -> int:
                     pub_socket.close(0)
             finally:
                 context.term()
-        return 0
+                stop_workers()
+
+    use_pidfd_child_watcher()
+
+    if args.zmq_sub:
+        try:
+            return asyncio.run(run_zmq_sub())
+        except KeyboardInterrupt:
+            return 0
 
     # Non-ZMQ path: use a default suffix and ball_id
     start_after_suffix = "000000000"
     default_ball_id = "default"  # Default ball_id when not using ZMQ
-    return launch_senders_with_suffix(start_after_suffix, default_ball_id)
+    try:
+        return asyncio.run(launch_senders_with_suffix(start_after_suffix, default_ball_id))
+    finally:
+        stop_workers()
 
 
 if __name__ == "__main__":
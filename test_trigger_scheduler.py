@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for the --zmq-sub trigger scheduling (dedupe and per-ball coalescing).
+Run with: python -m unittest test_trigger_scheduler
+"""
+import asyncio
+import unittest
+
+from run_senders_from_config import TriggerScheduler
+
+
+# Bounds every wait, so a launch that never happens fails instead of hanging
+WAIT_S = 2.0
+
+
+def make_trigger(num: int, ball_id: str = "ball0") -> tuple:
+    suffix = f"{num:09d}"
+    return ball_id, num, suffix, "camera_then_num", "key", "FE"
+
+
+class FakeLaunch:
+    """Launch stand-in: each call waits for release() and returns the next rc."""
+
+    def __init__(self, *rcs: int):
+        self.rcs = list(rcs)
+        self.calls = []
+        self.started = asyncio.Event()
+        self.release_event = asyncio.Event()
+
+    async def __call__(self, trigger: tuple) -> int:
+        self.calls.append(trigger)
+        self.started.set()
+        await self.release_event.wait()
+        self.release_event.clear()
+        return self.rcs.pop(0)
+
+    async def release(self) -> None:
+        self.started.clear()
+        self.release_event.set()
+        await asyncio.sleep(0)
+
+
+async def drain(scheduler: TriggerScheduler) -> None:
+    while scheduler.inflight:
+        await asyncio.wait_for(asyncio.gather(*scheduler.inflight.values()), WAIT_S)
+
+
+class TriggerSchedulerTest(unittest.TestCase):
+    def test_retry_during_failed_launch_is_relaunched(self):
+        async def run():
+            launch = FakeLaunch(1, 0)
+            scheduler = TriggerScheduler(launch, dedupe_secs=60.0)
+            trigger = make_trigger(3)
+            scheduler.submit(trigger)
+            await asyncio.wait_for(launch.started.wait(), WAIT_S)
+            # Upstream retries while the first launch is still running
+            scheduler.submit(trigger)
+            await launch.release()  # first launch fails
+            await asyncio.wait_for(launch.started.wait(), WAIT_S)
+            await launch.release()  # the retry succeeds
+            await drain(scheduler)
+            return launch.calls
+
+        self.assertEqual(asyncio.run(run()), [make_trigger(3), make_trigger(3)])
+
+    def test_retry_during_successful_launch_is_skipped(self):
+        async def run():
+            launch = FakeLaunch(0)
+            scheduler = TriggerScheduler(launch, dedupe_secs=60.0)
+            trigger = make_trigger(3)
+            scheduler.submit(trigger)
+            await asyncio.wait_for(launch.started.wait(), WAIT_S)
+            scheduler.submit(trigger)
+            await launch.release()
+            await drain(scheduler)
+            # Arriving after the success is skipped as well
+            scheduler.submit(trigger)
+            await drain(scheduler)
+            return launch.calls
+
+        self.assertEqual(asyncio.run(run()), [make_trigger(3)])
+
+    def test_retry_after_failed_launch_is_relaunched(self):
+        async def run():
+            launch = FakeLaunch(1, 0)
+            scheduler = TriggerScheduler(launch, dedupe_secs=60.0)
+            trigger = make_trigger(3)
+            scheduler.submit(trigger)
+            await launch.release()
+            await drain(scheduler)
+            scheduler.submit(trigger)
+            await launch.release()
+            await drain(scheduler)
+            return launch.calls
+
+        self.assertEqual(asyncio.run(run()), [make_trigger(3), make_trigger(3)])
+
+    def test_triggers_during_launch_collapse_to_highest_frame(self):
+        async def run():
+            launch = FakeLaunch(0, 0)
+            scheduler = TriggerScheduler(launch, dedupe_secs=60.0)
+            scheduler.submit(make_trigger(3))
+            await asyncio.wait_for(launch.started.wait(), WAIT_S)
+            scheduler.submit(make_trigger(7))
+            scheduler.submit(make_trigger(5))
+            await launch.release()
+            await asyncio.wait_for(launch.started.wait(), WAIT_S)
+            await launch.release()
+            await drain(scheduler)
+            return launch.calls
+
+        self.assertEqual(asyncio.run(run()), [make_trigger(3), make_trigger(7)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,14 +2,35 @@ import zmq
 import json
 import time
 
+EXPECTED_SUBSCRIBERS = 1
+SUBSCRIBE_TIMEOUT_S = 10
+# Set to e.g. "/tmp/trigger_pub.sock" to also bind there, so launchers on this
+# host can connect over IPC instead of TCP. Keep it different from any
+# forwarder's --forward-ipc-path: a second ipc bind takes the path over.
+IPC_PATH = ""
+
 ctx = zmq.Context()
-sock = ctx.socket(zmq.PUB)
+# XPUB instead of PUB: subscriptions come back to us as messages, so we can
+# publish as soon as subscribers are really attached instead of guessing
+sock = ctx.socket(zmq.XPUB)
+sock.setsockopt(zmq.XPUB_VERBOSE, 1)  # report every subscribe, not just the first per topic
 sock.bind("tcp://*:5876")  
+if IPC_PATH:
+    sock.bind(f"ipc://{IPC_PATH}")
 # sock.bind("tcp://localhost:5619")       
 
 # ---- WAIT BEFORE PUBLISHING ----
-print("⏳ Waiting 2 seconds for subscribers to connect...")
-time.sleep(2)  # Important!
+print(f"⏳ Waiting for {EXPECTED_SUBSCRIBERS} subscriber(s) to connect...")
+subscribed = 0
+deadline = time.monotonic() + SUBSCRIBE_TIMEOUT_S
+while subscribed < EXPECTED_SUBSCRIBERS:
+    remaining_ms = int((deadline - time.monotonic()) * 1000)
+    if remaining_ms <= 0 or not sock.poll(remaining_ms):
+        print(f"⚠️ Only {subscribed} subscriber(s) after {SUBSCRIBE_TIMEOUT_S}s, publishing anyway")
+        break
+    # Subscription frames start with 0x01 (subscribe) or 0x00 (unsubscribe)
+    if sock.recv()[:1] == b"\x01":
+        subscribed += 1
 
 
 ball_id="M5_1_0_2"
@@ -42,8 +63,11 @@ payload = {
     "side": "FE"
 }
 
+# Encoded once; the bytes can be re-sent as-is without another json.dumps
+payload_bytes = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+
 print("Sending message....")
-sock.send_json(payload)
+sock.send(payload_bytes, copy=False)
 print("📤 Published job to subscribers.")
 
 